@@ -1,8 +1,16 @@
 import os
+import json
+import mmap
+import uuid
+import atexit
+import logging
+import functools
 import subprocess
 import tempfile
+import threading
 import shutil
-from io import BytesIO
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from ..func import set_file_name, video_type
 
 # 导入ComfyUI的文件路径管理
@@ -13,6 +21,203 @@ try:
 except ImportError:
     COMFYUI_INTEGRATION = False
 
+# 日志代替print：批量执行时print会抢GIL并被ComfyUI镜像到web端，%格式化保持惰性
+log = logging.getLogger(__name__)
+
+# comfy_api的VideoFromFile只在模块加载时解析一次，调用路径上不再反复尝试导入
+try:
+    from comfy_api.input_impl.video_types import VideoFromFile as _VideoFromFile
+except ImportError:
+    try:
+        from comfy_api.latest._input_impl.video_types import (
+            VideoFromFile as _VideoFromFile,
+        )
+    except ImportError:
+        _VideoFromFile = None
+
+# 模块加载时解析一次，避免每次调用都走$PATH查找/重建扩展名元组
+_FFMPEG = shutil.which("ffmpeg") or "ffmpeg"
+_FFPROBE = shutil.which("ffprobe") or "ffprobe"
+_VIDEO_EXTS = tuple(e.lower() for e in video_type())
+
+
+# ffprobe的format_name → ffmpeg -f 解复用器名（只收录名字不一致的多格式组合）
+_FORMAT_TO_DEMUXER = {
+    "mov,mp4,m4a,3gp,3g2,mj2": "mp4",
+    "matroska,webm": "matroska",
+}
+
+
+def _probe_media_info(video_path):
+    """
+    一次ffprobe拿到裁剪决策需要的全部信息：
+    duration（秒）、demuxer（-f可用的解复用器名）、codec（首个视频流编码名）
+    探测失败时对应字段为None
+    """
+    info = {"duration": None, "demuxer": None, "codec": None}
+    command = [
+        _FFPROBE,
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "stream=codec_name",
+        "-show_entries",
+        "format=duration,format_name",
+        "-of",
+        "json",
+        video_path,
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True)
+        if result.returncode != 0:
+            return info
+        data = json.loads(result.stdout.decode("utf-8"))
+    except (OSError, ValueError):
+        return info
+
+    fmt = data.get("format", {})
+    try:
+        info["duration"] = float(fmt["duration"])
+    except (KeyError, TypeError, ValueError):
+        pass
+    fmt_name = fmt.get("format_name")
+    if fmt_name:
+        info["demuxer"] = _FORMAT_TO_DEMUXER.get(fmt_name, fmt_name.split(",")[0])
+    streams = data.get("streams") or []
+    if streams:
+        info["codec"] = streams[0].get("codec_name") or None
+    return info
+
+
+# (视频编码, 输出容器)能否-c copy的静态规则表；未收录的组合保守走重新编码
+_COPY_OK = {
+    ("h264", "mp4"): True,
+    ("h264", "mov"): True,
+    ("h264", "mkv"): True,
+    ("hevc", "mp4"): True,
+    ("hevc", "mov"): True,
+    ("hevc", "mkv"): True,
+    ("av1", "mp4"): True,
+    ("av1", "mkv"): True,
+    ("vp8", "webm"): True,
+    ("vp8", "mkv"): True,
+    ("vp9", "webm"): True,
+    ("vp9", "mkv"): True,
+    ("vp9", "mp4"): False,  # 主流播放器对mp4里的vp9支持差
+    ("mpeg4", "mp4"): True,
+    ("mpeg4", "avi"): True,
+}
+
+
+def _probe_nvenc():
+    """检测ffmpeg是否编译了NVENC硬件编码器（模块加载时只执行一次）"""
+    try:
+        result = subprocess.run(
+            [_FFMPEG, "-hide_banner", "-encoders"], capture_output=True
+        )
+        return b"h264_nvenc" in result.stdout
+    except OSError:
+        return False
+
+
+_HAS_NVENC = _probe_nvenc()
+
+# 会话级临时目录池：复用目录省掉每次mkdtemp的mkdir+随机名生成+stat
+# 按父目录分池（tmpfs/ComfyUI temp/系统temp各自独立），退出时统一删除
+_TEMP_DIR_POOLS = {}
+_TEMP_DIR_LOCK = threading.Lock()
+_TEMP_DIR_POOL_SIZE = 8
+
+
+def _acquire_temp_dir(prefix, base_dir=None):
+    """从池中取一个空临时目录，池空时再新建"""
+    with _TEMP_DIR_LOCK:
+        pool = _TEMP_DIR_POOLS.get(base_dir)
+        if pool:
+            return pool.popleft()
+    return tempfile.mkdtemp(prefix=prefix, dir=base_dir)
+
+
+def _release_temp_dir(temp_dir, base_dir=None):
+    """清空目录内容后放回池中复用，池已满则直接删除"""
+    try:
+        with os.scandir(temp_dir) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    os.unlink(entry.path)
+    except OSError:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return
+    with _TEMP_DIR_LOCK:
+        pool = _TEMP_DIR_POOLS.setdefault(base_dir, deque())
+        if len(pool) < _TEMP_DIR_POOL_SIZE:
+            pool.append(temp_dir)
+            return
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@atexit.register
+def _drain_temp_dir_pools():
+    """解释器退出时删除所有池中的空闲目录"""
+    with _TEMP_DIR_LOCK:
+        for pool in _TEMP_DIR_POOLS.values():
+            while pool:
+                shutil.rmtree(pool.popleft(), ignore_errors=True)
+
+
+# 留存结果的tmpfs目录登记表：ComfyUI只清理自己的temp目录，/dev/shm里的
+# 目录没人管，必须自己在退出时删除；总量超过上限后新调用回退到磁盘temp
+_TMPFS_KEPT_DIRS = []
+_TMPFS_KEPT_BYTES = 0
+_TMPFS_KEEP_LIMIT = 4 * 1024**3  # 4GiB
+
+
+def _dir_size(path):
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _register_kept_tmpfs_dir(temp_dir):
+    """登记一个留存结果的tmpfs目录，供退出清理和容量核算"""
+    global _TMPFS_KEPT_BYTES
+    size = _dir_size(temp_dir)
+    with _TEMP_DIR_LOCK:
+        _TMPFS_KEPT_DIRS.append(temp_dir)
+        _TMPFS_KEPT_BYTES += size
+
+
+def _tmpfs_budget_available():
+    with _TEMP_DIR_LOCK:
+        return _TMPFS_KEPT_BYTES < _TMPFS_KEEP_LIMIT
+
+
+@atexit.register
+def _remove_kept_tmpfs_dirs():
+    """解释器退出时删除所有留存在tmpfs上的结果目录"""
+    with _TEMP_DIR_LOCK:
+        while _TMPFS_KEPT_DIRS:
+            shutil.rmtree(_TMPFS_KEPT_DIRS.pop(), ignore_errors=True)
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_save_methods(video_cls):
+    """按视频对象的类缓存可用的保存方法名，hasattr探测每个类只做一次"""
+    return tuple(
+        name
+        for name in ("save", "write_video", "to_file", "export", "save_to")
+        if hasattr(video_cls, name)
+    )
+
 
 class VideoDurationTrim:
     """
@@ -54,6 +259,13 @@ class VideoDurationTrim:
                         "tooltip": "是否保存到ComfyUI的output目录（会被ComfyUI管理，不会自动清理）",
                     },
                 ),
+                "use_gpu": (
+                    "BOOLEAN",
+                    {
+                        "default": False,
+                        "tooltip": "重新编码时使用NVENC硬件编码（需要ffmpeg支持h264_nvenc，流复制时无影响）",
+                    },
+                ),
             },
         }
 
@@ -64,24 +276,40 @@ class VideoDurationTrim:
     CATEGORY = "🔥FFmpeg"
 
     def trim_video_by_duration(
-        self, video, duration, output_path="", save_to_output=False
+        self, video, duration, output_path="", save_to_output=False, use_gpu=False
     ):
         """
         根据duration裁剪视频，从0秒开始到指定时长
         """
         temp_input_path = None
         temp_output_path = None
+        owns_input = True  # 输入文件是否由本节点创建（借用用户路径时为False，绝不改动）
 
         try:
-            # 创建临时目录 - 优先使用ComfyUI的temp目录
-            if COMFYUI_INTEGRATION:
+            # 创建临时目录
+            # 结果只作为中间产物时优先用/dev/shm（tmpfs，内存盘）：
+            # ffmpeg写出+VideoFromFile读回只消耗内存带宽，不占SSD I/O
+            keep_in_temp = not save_to_output and not (
+                output_path and output_path.strip()
+            )
+            temp_base = None
+            if (
+                keep_in_temp
+                and os.path.isdir("/dev/shm")
+                and _tmpfs_budget_available()
+            ):
+                temp_base = "/dev/shm"
+                temp_dir = _acquire_temp_dir("comfyui_video_trim_", temp_base)
+                log.debug("使用tmpfs temp目录: %s", temp_dir)
+            elif COMFYUI_INTEGRATION:
                 comfyui_temp_dir = folder_paths.get_temp_directory()
                 os.makedirs(comfyui_temp_dir, exist_ok=True)
-                temp_dir = tempfile.mkdtemp(prefix="video_trim_", dir=comfyui_temp_dir)
-                print(f"使用ComfyUI temp目录: {temp_dir}")
+                temp_base = comfyui_temp_dir
+                temp_dir = _acquire_temp_dir("video_trim_", temp_base)
+                log.debug("使用ComfyUI temp目录: %s", temp_dir)
             else:
-                temp_dir = tempfile.mkdtemp(prefix="comfyui_video_trim_")
-                print(f"使用系统temp目录: {temp_dir}")
+                temp_dir = _acquire_temp_dir("comfyui_video_trim_")
+                log.debug("使用系统temp目录: %s", temp_dir)
 
             # 处理输入视频 - 将VIDEO类型保存到临时文件
             if hasattr(video, "save_video"):
@@ -102,43 +330,60 @@ class VideoDurationTrim:
                 with open(temp_input_path, "wb") as f:
                     video.write_to(f)
             elif isinstance(video, (str, os.PathLike)):
-                # 如果是文件路径
+                # 如果是文件路径 - 直接借用，省掉一次全文件拷贝
                 temp_input_path = str(video)
+                owns_input = False
                 if not os.path.exists(temp_input_path):
                     raise ValueError(f"视频文件不存在: {temp_input_path}")
             elif hasattr(video, "read"):
                 # 如果是文件对象或BytesIO
                 temp_input_path = os.path.join(temp_dir, "input_video.mp4")
                 with open(temp_input_path, "wb") as f:
-                    if hasattr(video, "getvalue"):
-                        f.write(video.getvalue())
+                    if hasattr(video, "getbuffer"):
+                        # BytesIO：getbuffer()暴露memoryview，写入时不产生额外的bytes拷贝
+                        f.write(video.getbuffer())
+                    elif hasattr(video, "fileno") and hasattr(os, "sendfile"):
+                        # fd支撑的文件对象：sendfile在内核态直接搬运，数据不进用户态
+                        try:
+                            src_fd = video.fileno()
+                            size = os.fstat(src_fd).st_size
+                            # 单次sendfile最多传约2GiB且可能短传，必须循环到传完
+                            offset = 0
+                            while offset < size:
+                                sent = os.sendfile(
+                                    f.fileno(), src_fd, offset, size - offset
+                                )
+                                if sent == 0:
+                                    raise OSError("sendfile提前返回0，源文件被截断")
+                                offset += sent
+                        except (OSError, ValueError):
+                            # fileno不可用（如包装对象）或sendfile不支持该fd时回退流式拷贝
+                            f.seek(0)
+                            f.truncate()
+                            if hasattr(video, "seek"):
+                                video.seek(0)
+                            shutil.copyfileobj(video, f, length=1024 * 1024)
                     else:
-                        f.write(video.read())
+                        # 普通文件对象：按1MiB块流式拷贝，避免一次性read()占用双倍内存
+                        if hasattr(video, "seek"):
+                            video.seek(0)
+                        shutil.copyfileobj(video, f, length=1024 * 1024)
             else:
                 # 处理VideoFromComponents等复杂视频对象
                 temp_input_path = os.path.join(temp_dir, "input_video.mp4")
                 saved = False
                 error_messages = []
 
-                # 尝试多种可能的保存方法
-                save_methods = [
-                    ("save", lambda v, p: v.save(p)),
-                    ("write_video", lambda v, p: v.write_video(p)),
-                    ("to_file", lambda v, p: v.to_file(p)),
-                    ("export", lambda v, p: v.export(p)),
-                    ("save_to", lambda v, p: v.save_to(p)),
-                ]
-
-                for method_name, method_func in save_methods:
-                    if hasattr(video, method_name):
-                        try:
-                            method_func(video, temp_input_path)
-                            saved = True
-                            print(f"成功使用 {method_name} 方法保存视频")
-                            break
-                        except Exception as e:
-                            error_messages.append(f"{method_name}: {str(e)}")
-                            continue
+                # 尝试多种可能的保存方法（方法名列表按类缓存，见_resolve_save_methods）
+                for method_name in _resolve_save_methods(type(video)):
+                    try:
+                        getattr(video, method_name)(temp_input_path)
+                        saved = True
+                        log.debug("成功使用 %s 方法保存视频", method_name)
+                        break
+                    except Exception as e:
+                        error_messages.append(f"{method_name}: {str(e)}")
+                        continue
 
                 # 如果所有保存方法都失败了，尝试字节数据方法
                 if not saved:
@@ -147,12 +392,12 @@ class VideoDurationTrim:
                             if hasattr(video, "tobytes"):
                                 f.write(video.tobytes())
                                 saved = True
-                                print("成功使用 tobytes 方法保存视频")
+                                log.debug("成功使用 tobytes 方法保存视频")
                             elif hasattr(video, "read"):
                                 video_data = video.read()
                                 f.write(video_data)
                                 saved = True
-                                print("成功使用 read 方法保存视频")
+                                log.debug("成功使用 read 方法保存视频")
                     except Exception as e:
                         error_messages.append(f"tobytes/read: {str(e)}")
 
@@ -169,160 +414,133 @@ class VideoDurationTrim:
             if not os.path.exists(temp_input_path):
                 raise ValueError("无法创建临时输入文件")
 
-            # 验证是否为视频文件
-            if not temp_input_path.lower().endswith(video_type()):
-                # 尝试重命名为.mp4
-                new_temp_input = temp_input_path + ".mp4"
-                os.rename(temp_input_path, new_temp_input)
-                temp_input_path = new_temp_input
-
             # 验证duration参数
             if duration <= 0:
                 raise ValueError("duration必须大于0")
 
-            # 确定输出路径
-            file_name = set_file_name(temp_input_path)
+            # 确定最终发布路径；ffmpeg始终先写temp_dir中的暂存文件，成功后再发布
+            # set_file_name只有秒级精度，并行批量时同一秒内必然撞名，追加uuid后缀
+            name_base, name_ext = os.path.splitext(set_file_name(temp_input_path))
+            file_name = f"{name_base}_{uuid.uuid4().hex[:8]}{name_ext}"
+            final_output_path = None
 
             if save_to_output and COMFYUI_INTEGRATION:
                 # 保存到ComfyUI的output目录
                 output_dir = folder_paths.get_output_directory()
                 video_subdir = os.path.join(output_dir, "video_trim")
                 os.makedirs(video_subdir, exist_ok=True)
-                temp_output_path = os.path.join(video_subdir, f"trimmed_{file_name}")
-                print(f"保存到ComfyUI output目录: {temp_output_path}")
+                final_output_path = os.path.join(video_subdir, f"trimmed_{file_name}")
+                log.debug("保存到ComfyUI output目录: %s", final_output_path)
             elif output_path and output_path.strip():
                 # 用户指定路径
                 if output_path.strip().lower() == "output" and COMFYUI_INTEGRATION:
                     # 特殊关键词：使用ComfyUI output目录
                     output_dir = folder_paths.get_output_directory()
-                    temp_output_path = os.path.join(output_dir, f"trimmed_{file_name}")
+                    final_output_path = os.path.join(
+                        output_dir, f"trimmed_{file_name}"
+                    )
                 else:
                     # 用户自定义路径
                     output_path = os.path.abspath(output_path.strip())
                     if os.path.isdir(output_path):
-                        temp_output_path = os.path.join(
+                        final_output_path = os.path.join(
                             output_path, f"trimmed_{file_name}"
                         )
                     else:
-                        temp_output_path = output_path
+                        final_output_path = output_path
                         # 确保输出目录存在
-                        os.makedirs(os.path.dirname(temp_output_path), exist_ok=True)
-                print(f"保存到用户指定路径: {temp_output_path}")
+                        os.makedirs(
+                            os.path.dirname(final_output_path), exist_ok=True
+                        )
+                log.debug("保存到用户指定路径: %s", final_output_path)
+
+            # 暂存文件位于temp_dir（可能在tmpfs上），避免ffmpeg直接对目标盘写放大
+            # 扩展名必须跟随最终发布路径：ffmpeg按暂存文件名选择封装容器，
+            # 用户指定.mkv输出时不能按输入的.mp4封装再硬链接过去
+            if final_output_path:
+                final_ext = os.path.splitext(final_output_path)[1]
+                if final_ext:
+                    file_name = os.path.splitext(file_name)[0] + final_ext
+            temp_output_path = os.path.join(temp_dir, f"trimmed_{file_name}")
+
+            # 一次ffprobe拿齐时长/容器/编码信息，快速路径和裁剪命令共用
+            media_info = _probe_media_info(temp_input_path)
+
+            # 快速路径：请求的时长已覆盖源视频全长时，不需要任何裁剪，跳过ffmpeg
+            src_duration = media_info["duration"]
+            if src_duration is not None and duration >= src_duration - 0.04:
+                log.debug(
+                    "裁剪时长(%ss)不小于源视频时长(%ss)，跳过FFmpeg处理",
+                    duration,
+                    src_duration,
+                )
+                if not owns_input and final_output_path is None:
+                    # 借用的输入且无落盘要求：直接原样返回源文件
+                    temp_output_path = temp_input_path
+                else:
+                    try:
+                        # 硬链接发布结果：同一inode，零字节拷贝
+                        os.link(temp_input_path, temp_output_path)
+                    except OSError:
+                        # 跨文件系统等场景回退为普通复制
+                        shutil.copyfile(temp_input_path, temp_output_path)
             else:
-                # 使用临时目录
-                temp_output_path = os.path.join(temp_dir, f"trimmed_{file_name}")
-                print(f"保存到临时目录: {temp_output_path}")
-
-            # 构建ffmpeg命令 - 从0秒开始裁剪指定时长
-            # 使用 -t 参数指定持续时间，而不是结束时间
-            command = [
-                "ffmpeg",
-                "-y",  # 覆盖输出文件
-                "-i",
-                temp_input_path,  # 输入视频路径
-                "-ss",
-                "0",  # 从0秒开始
-                "-t",
-                str(duration),  # 持续时长
-                "-c",
-                "copy",  # 复制流，避免重新编码（更快）
-                temp_output_path,
-            ]
-
-            print(f"执行FFmpeg命令: {' '.join(command)}")
-
-            # 执行命令并检查错误
-            result = subprocess.run(
-                command, stderr=subprocess.PIPE, stdout=subprocess.PIPE, text=True
-            )
-
-            # 检查返回码
-            if result.returncode != 0:
-                print(f"FFmpeg错误输出: {result.stderr}")
-                # 如果-c copy失败，尝试重新编码
-                print("尝试使用重新编码模式...")
-                command_reencode = [
-                    "ffmpeg",
-                    "-y",
-                    "-i",
+                self._run_ffmpeg_trim(
                     temp_input_path,
-                    "-ss",
-                    "0",
-                    "-t",
-                    str(duration),
-                    "-c:v",
-                    "libx264",  # 重新编码视频
-                    "-c:a",
-                    "aac",  # 重新编码音频
                     temp_output_path,
-                ]
-
-                result = subprocess.run(
-                    command_reencode,
-                    stderr=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    text=True,
+                    duration,
+                    use_gpu=use_gpu,
+                    media_info=media_info,
                 )
 
-                if result.returncode != 0:
-                    raise ValueError(f"FFmpeg执行失败: {result.stderr}")
-
-            print(f"视频裁剪完成: {temp_output_path}")
+            log.debug("视频裁剪完成: %s", temp_output_path)
 
             # 验证输出文件是否存在
             if not os.path.exists(temp_output_path):
                 raise ValueError("裁剪后的视频文件未生成")
 
-            # 读取裁剪后的视频并转换为VIDEO类型
-            # 这里需要根据ComfyUI的VIDEO类型实现来调整
-            try:
-                # 方法1: 尝试使用VideoFromFile (如Luma节点)
-                from comfy_api.input_impl.video_types import VideoFromFile
-
-                # VideoFromFile 期望文件路径，不是BytesIO
-                trimmed_video = VideoFromFile(temp_output_path)
-                print(f"成功使用VideoFromFile创建视频对象: {temp_output_path}")
-
-            except ImportError:
-                # 方法2: 如果没有VideoFromFile，尝试其他方式
+            # 发布结果：优先硬链接（同inode，零字节拷贝），
+            # 跨文件系统（如tmpfs→磁盘）时回退复制，copyfile内部会走sendfile
+            if final_output_path and final_output_path != temp_output_path:
+                if os.path.exists(final_output_path):
+                    os.remove(final_output_path)
                 try:
-                    # 尝试使用BytesIO方式
-                    with open(temp_output_path, "rb") as f:
-                        video_data = BytesIO(f.read())
-                        # 尝试其他可能的VIDEO构造方式
-                        from comfy_api.latest._input_impl.video_types import (
-                            VideoFromFile as VideoFromFileLatest,
-                        )
-
-                        trimmed_video = VideoFromFileLatest(video_data)
-                        print("成功使用latest VideoFromFile创建视频对象")
-                except Exception as e:
-                    print(f"BytesIO方式失败: {e}")
-                    # 方法3: 返回文件路径
-                    trimmed_video = temp_output_path
-                    print(f"返回文件路径作为VIDEO类型: {temp_output_path}")
-            except Exception as e:
-                print(f"VideoFromFile创建失败: {e}")
-                # 尝试备用方案
+                    os.link(temp_output_path, final_output_path)
+                except OSError:
+                    shutil.copyfile(temp_output_path, final_output_path)
+                temp_output_path = final_output_path
+                log.debug("结果已发布到: %s", final_output_path)
+
+            # 读取裁剪后的视频并转换为VIDEO类型（_VideoFromFile在模块加载时已解析）
+            if _VideoFromFile is not None:
                 try:
-                    # 尝试使用latest版本
-                    from comfy_api.latest._input_impl.video_types import (
-                        VideoFromFile as VideoFromFileLatest,
-                    )
-
-                    trimmed_video = VideoFromFileLatest(temp_output_path)
-                    print("成功使用latest VideoFromFile创建视频对象")
-                except Exception as e2:
-                    print(f"latest VideoFromFile也失败: {e2}")
-                    # 最后的备用方案：返回文件路径
-                    trimmed_video = temp_output_path
-                    print(f"返回文件路径作为VIDEO类型: {temp_output_path}")
+                    # 优先传文件路径 (如Luma节点的用法)
+                    trimmed_video = _VideoFromFile(temp_output_path)
+                    log.debug("成功使用VideoFromFile创建视频对象: %s", temp_output_path)
+                except Exception as e:
+                    log.warning("VideoFromFile创建失败: %s", e)
+                    try:
+                        # 备用方案：mmap对象本身就是可seek的文件对象，直接传入
+                        # 由OS页缓存支撑，按需缺页载入，不往Python堆里复制
+                        with open(temp_output_path, "rb") as f:
+                            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                        trimmed_video = _VideoFromFile(mm)
+                        log.debug("成功使用mmap缓冲创建视频对象")
+                    except Exception as e2:
+                        log.warning("mmap方式也失败: %s", e2)
+                        # 最后的备用方案：返回文件路径
+                        trimmed_video = temp_output_path
+                        log.debug("返回文件路径作为VIDEO类型: %s", temp_output_path)
+            else:
+                # 没有comfy_api时直接返回文件路径
+                trimmed_video = temp_output_path
+                log.debug("返回文件路径作为VIDEO类型: %s", temp_output_path)
 
             return (trimmed_video,)
 
         except Exception as e:
             error_msg = f"视频裁剪失败: {str(e)}"
-            print(error_msg)
+            log.error(error_msg)
             raise ValueError(error_msg)
 
         finally:
@@ -361,10 +579,154 @@ class VideoDurationTrim:
                             cleanup_reason = "保留临时文件供后续使用"
 
                     if should_cleanup:
-                        shutil.rmtree(temp_dir, ignore_errors=True)
-                        print(f"✅ 清理临时目录: {temp_dir} ({cleanup_reason})")
+                        # 清空后放回池中复用，而不是直接删除
+                        _release_temp_dir(temp_dir, temp_base)
+                        log.debug("清理临时目录: %s (%s)", temp_dir, cleanup_reason)
                     else:
-                        print(f"📁 保留临时目录: {temp_dir} ({cleanup_reason})")
+                        if temp_base == "/dev/shm":
+                            # ComfyUI不会清理/dev/shm：登记到退出钩子并计入tmpfs容量
+                            _register_kept_tmpfs_dir(temp_dir)
+                            cleanup_reason = "tmpfs结果目录，解释器退出时删除"
+                        log.debug("保留临时目录: %s (%s)", temp_dir, cleanup_reason)
 
                 except Exception as e:
-                    print(f"❌ 清理临时文件时出错: {str(e)}")
+                    log.warning("清理临时文件时出错: %s", e)
+
+    @classmethod
+    def trim_batch(
+        cls, videos, durations, output_path="", save_to_output=False, use_gpu=False
+    ):
+        """
+        并行批量裁剪多个视频，按输入顺序返回结果列表
+
+        copy模式下单个ffmpeg只用1-2个线程做封装，串行跑会让其它核心空闲；
+        ffmpeg在子进程中执行不占GIL，线程池即可实现多进程级并行
+        （与func.py中copy_images_to_directory的用法一致）
+        """
+        if len(videos) != len(durations):
+            raise ValueError("videos和durations的数量不一致")
+        if not videos:
+            return []
+
+        node = cls()
+        results = [None] * len(videos)
+        max_workers = min(len(videos), os.cpu_count() or 1)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    node.trim_video_by_duration,
+                    video,
+                    dur,
+                    output_path,
+                    save_to_output,
+                    use_gpu,
+                ): i
+                for i, (video, dur) in enumerate(zip(videos, durations))
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()[0]
+
+        return results
+
+    def _run_ffmpeg_trim(
+        self, temp_input_path, temp_output_path, duration, use_gpu=False, media_info=None
+    ):
+        """
+        执行实际的FFmpeg裁剪：凭media_info判断能否流复制，只调用一次ffmpeg
+        """
+        if media_info is None:
+            media_info = _probe_media_info(temp_input_path)
+
+        # 规则表查询代替"先试-c copy、失败再重编码"的两次ffmpeg调用
+        out_ext = os.path.splitext(temp_output_path)[1].lower().lstrip(".")
+        can_copy = _COPY_OK.get((media_info["codec"], out_ext), False)
+        # 重新编码时若用户开启GPU且ffmpeg带NVENC，解码和编码都留在GPU上
+        use_nvenc = (not can_copy) and use_gpu and _HAS_NVENC
+
+        # 扩展名无法触发ffmpeg按文件名选择解复用器时，显式用-f告知
+        # （代替以前重命名文件加.mp4后缀的做法——零文件系统操作，也不会动用户的文件）
+        input_format = None
+        if not temp_input_path.lower().endswith(_VIDEO_EXTS):
+            input_format = media_info["demuxer"]
+
+        # 构建ffmpeg命令 - 从0秒开始裁剪指定时长
+        # -ss放在-i之前使用输入端seek（解复用层定位，跳过逐包解析），配合-c copy完全避免重新编码
+        command = [
+            _FFMPEG,
+            "-y",  # 覆盖输出文件
+            "-hide_banner",
+            "-nostats",
+            "-loglevel",
+            "error",  # 减少终端输出开销
+            "-probesize",
+            "32",
+            "-analyzeduration",
+            "0",  # MP4头很小，激进限制探测时间，消除默认约5秒的流分析
+            "-fflags",
+            "+nobuffer+fastseek",
+        ]
+
+        if use_nvenc:
+            # -hwaccel必须位于-i之前；输出格式保持cuda实现GPU帧零拷贝直通
+            command += ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"]
+
+        if input_format:
+            command += ["-f", input_format]
+
+        command += [
+            "-ss",
+            "0",  # 从0秒开始（输入端seek更快）
+            "-t",
+            str(duration),  # 持续时长
+            "-i",
+            temp_input_path,  # 输入视频路径
+        ]
+
+        if can_copy:
+            command += [
+                "-c",
+                "copy",  # 复制流，避免重新编码（更快）
+                "-avoid_negative_ts",
+                "make_zero",  # 修正copy模式下可能出现的负时间戳
+            ]
+            if out_ext in ("mp4", "mov"):
+                command += ["-movflags", "+faststart"]  # moov前置，便于流式播放
+        elif use_nvenc:
+            # NVENC硬件编码：p1档位最快，CPU占用最低
+            command += [
+                "-c:v",
+                "h264_nvenc",
+                "-preset",
+                "p1",
+                "-c:a",
+                "aac",
+            ]
+        else:
+            # 编码/容器不支持流复制（或探测失败），直接重新编码
+            # ultrafast偏向速度：这里只是裁剪，不是发布级压制
+            command += [
+                "-c:v",
+                "libx264",  # 重新编码视频
+                "-preset",
+                "ultrafast",
+                "-tune",
+                "fastdecode",
+                "-c:a",
+                "aac",  # 重新编码音频
+            ]
+
+        command.append(temp_output_path)
+
+        log.info("执行FFmpeg命令: %s", " ".join(command))
+
+        # 执行命令并检查错误
+        # stdout丢弃、stderr保持bytes：成功路径不做任何UTF-8解码和缓冲
+        result = subprocess.run(
+            command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+
+        if result.returncode != 0:
+            raise ValueError(
+                f"FFmpeg执行失败: {result.stderr.decode('utf-8', 'replace')}"
+            )
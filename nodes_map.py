@@ -1,23 +1,24 @@
-from .nodes.addTextWatermark import *
-from .nodes.frames2video import *
-from .nodes.video2frames import *
-from .nodes.addImgWatermark import *
-from .nodes.videoFlip import *
-from .nodes.extractAudio import *
-from .nodes.loadImageFromDir import *
-from .nodes.imageCopy import *
-from .nodes.imagePath2Tensor import *
-from .nodes.mergingVideoByTwo import *
-from .nodes.mergingVideoByPlenty import *
-from .nodes.stitchingVideo import *
-from .nodes.multiCuttingVideo import *
-from .nodes.singleCuttingVideo import *
-from .nodes.addAudio import *
-from .nodes.imagesSave import *
-from .nodes.pipVideo import *
-from .nodes.videoTransition import *
-from .nodes.videoPlayback import *
-from .nodes.videoDurationTrim import *
+# 只导入NODE_CLASS_MAPPINGS需要的类，避免通配符导入绑定各模块的全部名字
+from .nodes.addTextWatermark import AddTextWatermark
+from .nodes.frames2video import Frames2Video
+from .nodes.video2frames import Video2Frames
+from .nodes.addImgWatermark import AddImgWatermark
+from .nodes.videoFlip import VideoFlip
+from .nodes.extractAudio import ExtractAudio
+from .nodes.loadImageFromDir import LoadImageFromDir
+from .nodes.imageCopy import ImageCopy
+from .nodes.imagePath2Tensor import ImagePath2Tensor
+from .nodes.mergingVideoByTwo import MergingVideoByTwo
+from .nodes.mergingVideoByPlenty import MergingVideoByPlenty
+from .nodes.stitchingVideo import StitchingVideo
+from .nodes.multiCuttingVideo import MultiCuttingVideo
+from .nodes.singleCuttingVideo import SingleCuttingVideo
+from .nodes.addAudio import AddAudio
+from .nodes.imagesSave import ImagesSave
+from .nodes.pipVideo import PipVideo
+from .nodes.videoTransition import VideoTransition
+from .nodes.videoPlayback import VideoPlayback
+from .nodes.videoDurationTrim import VideoDurationTrim
 
 NODE_CLASS_MAPPINGS = {
     "Video2Frames": Video2Frames,